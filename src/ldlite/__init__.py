@@ -38,14 +38,26 @@ Example:
 import json
 import sqlite3
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
 
 import duckdb
 # import pandas
 import psycopg2
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ._csv import _to_csv
+from ._ingest import _begin_bulk_load
+from ._ingest import _end_bulk_load
+from ._ingest import _insert_rows
 from ._jsonx import Attr
 from ._jsonx import _drop_json_tables
 from ._jsonx import _transform_json
@@ -55,13 +67,13 @@ from ._request import _request_get
 from ._select import _select
 from ._sqlx import _DBType
 from ._sqlx import _autocommit
-from ._sqlx import _encode_sql_str
 from ._sqlx import _json_type
 from ._sqlx import _sqlid
 from ._sqlx import _strip_schema
 # from src.ldlite._csv import *
 from ._xlsx import _to_xlsx
 
+_digits_to_ones = bytes.maketrans(b'023456789', b'111111111')
 
 # from warnings import warn
 
@@ -100,6 +112,14 @@ class LDLite:
         self.okapi_password = None
         self._okapi_timeout = 60
         self._okapi_max_retries = 2
+        self._okapi_max_workers = 8
+        self._okapi_hdr = None
+        # Reuse connections to FOLIO across requests, with enough pooled
+        # connections for concurrent page requests.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
 
     def _set_page_size(self, page_size):
         self.page_size = page_size
@@ -193,8 +213,11 @@ class LDLite:
                 'password': self.okapi_password}
 
         authn = self.okapi_url + '/authn/' + ('login' if self.legacy_auth else 'login-with-expiry')
-        resp = requests.post(authn, headers=hdr, data=json.dumps(data),
-                             timeout=self._okapi_timeout)
+        resp = self._session.post(authn, headers=hdr, data=json.dumps(data),
+                                  timeout=self._okapi_timeout)
+        # The token is sent as X-Okapi-Token, so keep the session from also
+        # sending the login cookies with every request.
+        self._session.cookies.clear()
         if resp.status_code != 201:
             raise RuntimeError('HTTP response status code: ' + str(resp.status_code))
 
@@ -209,6 +232,52 @@ class LDLite:
         if self.login_token is None:
             raise RuntimeError('connection to folio not configured: use connect_folio()')
 
+    def _folio_headers(self):
+        hdr = self._okapi_hdr
+        if hdr is None or hdr['X-Okapi-Tenant'] != self.okapi_tenant or hdr['X-Okapi-Token'] != self.login_token:
+            self._okapi_hdr = {'X-Okapi-Tenant': self.okapi_tenant, 'X-Okapi-Token': self.login_token}
+        return self._okapi_hdr
+
+    def _folio_request(self, url, params):
+        # Only sends the request, so it is safe to call from worker threads;
+        # the headers are returned so that a 401 can be traced to its token.
+        hdr = self._folio_headers()
+        resp = _request_get(self._session, url, params=params, headers=hdr, timeout=self._okapi_timeout,
+                            max_retries=self._okapi_max_retries)
+        return hdr, resp
+
+    def _folio_get_json(self, url, params, sent=None):
+        # Must be called from the main thread, because a 401 response leads to
+        # a new login.  *sent* is an earlier result of _folio_request().
+        hdr, resp = self._folio_request(url, params) if sent is None else sent
+        if resp.status_code == 401:
+            # Retry
+            # Warning! There is now an edge case with expiring tokens.
+            # If a request has been retried some number of times before the token expired
+            # then it would be retried for the full _okapi_max_retries value again.
+            # This will be cleaned up in future releases after tests are added allow for bigger internal changes.
+            # Concurrent page requests can all fail on the same expired token,
+            # so log in again only if that token is still the current one.
+            if hdr['X-Okapi-Token'] == self.login_token:
+                self._login()
+            hdr, resp = self._folio_request(url, params)
+        if resp.status_code != 200:
+            raise RuntimeError('HTTP response status code: ' + str(resp.status_code))
+        try:
+            # Decode the body bytes directly rather than through resp.json(),
+            # which first builds a decoded text copy of the whole page.
+            # orjson converts integers outside the 64-bit range to floats and
+            # rejects NaN, so pages with runs of 19 or more digits, or that
+            # orjson cannot decode, are left to the json module.
+            if orjson is not None and b'1' * 19 not in resp.content.translate(_digits_to_ones):
+                try:
+                    return orjson.loads(resp.content)
+                except orjson.JSONDecodeError:
+                    pass
+            return json.loads(resp.content)
+        except (json.JSONDecodeError, ValueError) as e:
+            raise RuntimeError('received server response: ' + resp.text) from e
+
     def _check_db(self):
         if self.db is None:
             raise RuntimeError('database connection not configured: use connect_db() or connect_db_postgresql()')
@@ -341,6 +410,10 @@ class LDLite:
         removed in the future.  Instead, specify *json_depth* as 0 to
         disable JSON transformation.
 
+        Records are loaded within a single transaction.  The database
+        connection should not have a transaction in progress when this
+        method is called, as any uncommitted changes may be rolled back.
+
         This method returns a list of newly created tables, or raises
         ValueError or RuntimeError.
 
@@ -366,43 +439,32 @@ class LDLite:
         querycopy = _query_dict(query)
         _drop_json_tables(self.db, table)
         _autocommit(self.db, self.dbtype, False)
+        cur = self.db.cursor()
         try:
-            cur = self.db.cursor()
-            try:
-                if len(schema_table) == 2:
-                    cur.execute('CREATE SCHEMA IF NOT EXISTS ' + _sqlid(schema_table[0]))
+            if len(schema_table) == 2:
+                cur.execute('CREATE SCHEMA IF NOT EXISTS ' + _sqlid(schema_table[0]))
+            if self.dbtype == _DBType.DUCKDB:
+                cur.execute('CREATE OR REPLACE TABLE ' + _sqlid(table) + '(__id integer, jsonb ' +
+                            _json_type(self.dbtype) + ')')
+            else:
                 cur.execute('DROP TABLE IF EXISTS ' + _sqlid(table))
-                cur.execute(
-                    'CREATE TABLE ' + _sqlid(table) + '(__id integer, jsonb ' + _json_type(self.dbtype) + ')')
-            finally:
-                cur.close()
+                cur.execute('CREATE TABLE ' + _sqlid(table) + '(__id integer, jsonb ' + _json_type(self.dbtype) + ')')
             self.db.commit()
+            url = self.okapi_url + path
+            querycopy['limit'] = str(self.page_size)
+            page_params = urlencode(querycopy, doseq=True)
             # First get total number of records
-            hdr = {'X-Okapi-Tenant': self.okapi_tenant, 'X-Okapi-Token': self.login_token}
             querycopy['offset'] = '0'
             querycopy['limit'] = '1'
-            resp = _request_get(self.okapi_url + path, params=querycopy, headers=hdr, timeout=self._okapi_timeout,
-                                max_retries=self._okapi_max_retries)
-            if resp.status_code == 401:
-                # Retry
-                # Warning! There is now an edge case with expiring tokens.
-                # If a request has been retried some number of times before the token expired
-                # then it would be retried for the full _okapi_max_retries value again.
-                # This will be cleaned up in future releases after tests are added allow for bigger internal changes.
-                self._login()
-                hdr = {'X-Okapi-Tenant': self.okapi_tenant, 'X-Okapi-Token': self.login_token}
-                resp = _request_get(self.okapi_url + path, params=querycopy, headers=hdr, timeout=self._okapi_timeout,
-                                    max_retries=self._okapi_max_retries)
-            if resp.status_code != 200:
-                raise RuntimeError('HTTP response status code: ' + str(resp.status_code))
-            try:
-                j = resp.json()
-            except (json.JSONDecodeError, ValueError) as e:
-                raise RuntimeError('received server response: ' + resp.text) from e
+            j = self._folio_get_json(url, querycopy)
             if 'totalRecords' in j:
                 total_records = j['totalRecords']
             else:
                 total_records = -1
+            # Records are returned under the first key other than totalRecords
+            records_key = None
+            if isinstance(j, dict):
+                records_key = next((k for k in j if k != 'totalRecords'), None)
             total = total_records if total_records is not None else 0
             if self._verbose:
                 print('ldlite: estimated row count: ' + str(total), file=sys.stderr)
@@ -418,56 +480,76 @@ class LDLite:
                 else:
                     pbar = tqdm(desc='reading', total=total, leave=False, mininterval=3, smoothing=0, colour='#A9A9A9',
                                 bar_format='{desc} {bar}{postfix}')
-            cur = self.db.cursor()
+            saved = _begin_bulk_load(cur, self.dbtype)
             try:
-                while True:
-                    offset = page * self.page_size
-                    lim = self.page_size
-                    querycopy['offset'] = str(offset)
-                    querycopy['limit'] = str(lim)
-                    resp = _request_get(self.okapi_url + path, params=querycopy, headers=hdr,
-                                        timeout=self._okapi_timeout, max_retries=self._okapi_max_retries)
-                    if resp.status_code == 401:
-                        # See warning above for retries
-                        self._login()
-                        hdr = {'X-Okapi-Tenant': self.okapi_tenant, 'X-Okapi-Token': self.login_token}
-                        resp = _request_get(self.okapi_url + path, params=querycopy, headers=hdr,
-                            timeout=self._okapi_timeout, max_retries=self._okapi_max_retries)
-                    if resp.status_code != 200:
-                        raise RuntimeError('HTTP response status code: ' + str(resp.status_code))
+                try:
+                    if self.dbtype == _DBType.DUCKDB:
+                        # DuckDB cursors are separate connections that remain in
+                        # autocommit mode, so the load transaction is opened here.
+                        cur.execute('BEGIN TRANSACTION')
+                    if self.dbtype == _DBType.POSTGRES:
+                        # The table is rebuilt from scratch if the load fails, so
+                        # there is no need to wait for WAL flushes at commit.
+                        cur.execute('SET LOCAL synchronous_commit = OFF')
+                    # Pages are requested concurrently up to the estimated row count,
+                    # and one page at a time beyond it, but are inserted in order so
+                    # that __id follows the result order.
+                    est_last_page = (total - 1) // self.page_size if total > 0 else 0
+                    last_page = None if limit is None else max(limit - 1, 0) // self.page_size
+                    executor = ThreadPoolExecutor(max_workers=self._okapi_max_workers)
+                    futures = deque()
                     try:
-                        j = resp.json()
-                    except (json.JSONDecodeError, ValueError) as e:
-                        raise RuntimeError('received server response: ' + resp.text) from e
-                    if isinstance(j, dict):
-                        data = list(j.values())[0]
-                    else:
-                        data = j
-                    lendata = len(data)
-                    if lendata == 0:
-                        break
-                    for d in data:
-                        cur.execute(
-                            'INSERT INTO ' + _sqlid(table) + ' VALUES(' + str(count + 1) + ',' + _encode_sql_str(
-                                self.dbtype, json.dumps(d, indent=4)) + ')')
-                        count += 1
-                        if not self._quiet:
-                            if pbartotal + 1 > total:
-                                pbartotal = total
-                                pbar.update(total - pbartotal)
-                            else:
-                                pbartotal += 1
-                                pbar.update(1)
-                        if limit is not None and count == limit:
-                            break
-                    if limit is not None and count == limit:
-                        break
-                    page += 1
+                        while True:
+                            while len(futures) < self._okapi_max_workers:
+                                p = page + len(futures)
+                                if last_page is not None and p > last_page:
+                                    break
+                                if p > est_last_page and len(futures) > 1:
+                                    break
+                                # The invariant part of the query string is encoded once per query
+                                params = page_params + '&offset=' + str(p * self.page_size)
+                                futures.append((params, executor.submit(self._folio_request, url, params)))
+                            if len(futures) == 0:
+                                break
+                            params, future = futures.popleft()
+                            j = self._folio_get_json(url, params, future.result())
+                            data = j if records_key is None else j[records_key]
+                            lendata = len(data)
+                            if lendata == 0:
+                                break
+                            if limit is not None and count + lendata > limit:
+                                data = data[:limit - count]
+                            ids = range(count + 1, count + len(data) + 1)
+                            docs = [json.dumps(d, separators=(',', ':')) for d in data]
+                            count += len(data)
+                            _insert_rows(cur, self.dbtype, table, ids, docs)
+                            if not self._quiet:
+                                advance = min(len(ids), max(0, total - pbartotal))
+                                pbartotal += advance
+                                pbar.update(advance)
+                            if lendata < self.page_size or (limit is not None and count == limit):
+                                break
+                            page += 1
+                    finally:
+                        for _, f in futures:
+                            f.cancel()
+                        executor.shutdown()
+                except Exception:
+                    if self.dbtype == _DBType.DUCKDB:
+                        # Do not let a failed ROLLBACK, e.g. when BEGIN itself
+                        # failed, replace the original error.
+                        try:
+                            cur.execute('ROLLBACK')
+                        except duckdb.Error:
+                            pass
+                    raise
+                if self.dbtype == _DBType.DUCKDB:
+                    cur.execute('COMMIT')
+                if not self._quiet:
+                    pbar.close()
+                self.db.commit()
             finally:
-                cur.close()
-            if not self._quiet:
-                pbar.close()
-            self.db.commit()
+                _end_bulk_load(self.db, cur, self.dbtype, saved)
             newtables = [table]
             newattrs = {}
             if json_depth > 0:
@@ -478,6 +560,7 @@ class LDLite:
                     newattrs[t]['__id'] = Attr('__id', 'bigint')
                 newattrs[table] = {'__id': Attr('__id', 'bigint')}
         finally:
+            cur.close()
             _autocommit(self.db, self.dbtype, True)
         # Create indexes
         if self.dbtype == 2:
@@ -486,18 +569,19 @@ class LDLite:
                 pbar = tqdm(desc='indexing', total=index_total, leave=False, mininterval=3, smoothing=0,
                             colour='#A9A9A9', bar_format='{desc} {bar}{postfix}')
                 pbartotal = 0
-            for t, attrs in newattrs.items():
-                for attr in attrs.values():
-                    cur = self.db.cursor()
-                    try:
-                        cur.execute('CREATE INDEX ON ' + _sqlid(t) + ' (' + _sqlid(attr.name) + ')')
-                    except (RuntimeError, psycopg2.Error):
-                        pass
-                    finally:
-                        cur.close()
-                    if not self._quiet:
-                        pbartotal += 1
-                        pbar.update(1)
+            cur = self.db.cursor()
+            try:
+                for t, attrs in newattrs.items():
+                    for attr in attrs.values():
+                        try:
+                            cur.execute('CREATE INDEX ON ' + _sqlid(t) + ' (' + _sqlid(attr.name) + ')')
+                        except (RuntimeError, psycopg2.Error):
+                            pass
+                        if not self._quiet:
+                            pbartotal += 1
+                            pbar.update(1)
+            finally:
+                cur.close()
             if not self._quiet:
                 pbar.close()
         # Return table names
@@ -0,0 +1,61 @@
+import csv
+import io
+
+import pandas
+
+from ._sqlx import _DBType
+from ._sqlx import _sqlid
+
+
+def _insert_rows(cur, dbtype, table, ids, docs):
+    if len(ids) == 0:
+        return
+    if dbtype == _DBType.DUCKDB:
+        # DuckDB scans a registered data frame in its native columnar
+        # format, which avoids parsing and binding the data as SQL.  The
+        # frame is built column-wise with __id typed to match the table.
+        df = pandas.DataFrame({'__id': pandas.Series(ids, dtype='int32'), 'jsonb': docs})
+        cur.register('ldlite_rows', df)
+        try:
+            cur.execute('INSERT INTO ' + _sqlid(table) + ' SELECT * FROM ldlite_rows')
+        finally:
+            cur.unregister('ldlite_rows')
+        return
+    if dbtype == _DBType.POSTGRES:
+        buf = io.StringIO()
+        csv.writer(buf).writerows(zip(ids, docs))
+        buf.seek(0)
+        cur.copy_expert('COPY ' + _sqlid(table) + '(__id, jsonb) FROM STDIN WITH (FORMAT csv)', buf)
+        return
+    # Bound parameters are passed through without being escaped into and
+    # reparsed from the SQL text.
+    cur.executemany('INSERT INTO ' + _sqlid(table) + ' VALUES(?,?)', zip(ids, docs))
+
+
+def _begin_bulk_load(cur, dbtype):
+    # The loaded table is recreated by rerunning the query if anything goes
+    # wrong, so durability settings can be relaxed while it is written.
+    saved = []
+    if dbtype == _DBType.SQLITE:
+        # journal_mode=OFF would make ROLLBACK undefined, so the journal is
+        # kept in memory instead.  Leaving WAL mode requires exclusive access
+        # to the database, so a WAL journal is left as it is.
+        for name, value in [('synchronous', 'OFF'), ('journal_mode', 'MEMORY')]:
+            cur.execute('PRAGMA ' + name)
+            old = cur.fetchone()[0]
+            if name == 'journal_mode' and old.lower() == 'wal':
+                continue
+            saved.append((name, old))
+            cur.execute('PRAGMA ' + name + '=' + value)
+            cur.fetchall()
+    return saved
+
+
+def _end_bulk_load(db, cur, dbtype, saved):
+    if dbtype == _DBType.SQLITE:
+        # PRAGMA journal_mode cannot be changed within a transaction; any
+        # transaction still open at this point belongs to a failed load.
+        db.rollback()
+    for name, value in saved:
+        cur.execute('PRAGMA ' + name + '=' + str(value))
+        cur.fetchall()
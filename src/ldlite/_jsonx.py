@@ -196,7 +196,47 @@ def _compile_attrs(dbtype, parents, prefix, jdict, newattrs, depth, max_depth, q
                              max_depth, qkey)
 
 
-def _transform_array_data(dbtype, prefix, cur, parents, jarray, newattrs, depth, row_ids, arrayattr, max_depth,
+class _InsertBuffer:
+    """Collects transformed rows and writes them as multi-row INSERT statements.
+
+    Each row is a dict mapping column names to encoded SQL values.  The rows
+    of each table are written in the order they were added, in a single
+    statement listing every column used by those rows, with NULL for columns
+    that a row does not have.  All tables are written once *size* rows have
+    been collected or when flush() is called.
+    """
+
+    def __init__(self, cur, size=1000):
+        self.cur = cur
+        self.size = size
+        self.rows = {}
+        self.count = 0
+
+    def add(self, table, row):
+        if table not in self.rows:
+            self.rows[table] = []
+        self.rows[table].append(row)
+        self.count += 1
+        if self.count >= self.size:
+            self.flush()
+
+    def flush(self):
+        for table, rows in self.rows.items():
+            cols = {}
+            for row in rows:
+                cols.update(dict.fromkeys(row))
+            values = ['(' + ','.join([row.get(c, 'NULL') for c in cols]) + ')' for row in rows]
+            q = ('INSERT INTO ' + _sqlid(table) + '(' + ','.join([_sqlid(c) for c in cols]) + ')VALUES' +
+                 ','.join(values))
+            try:
+                self.cur.execute(q)
+            except (RuntimeError, psycopg2.Error) as e:
+                raise RuntimeError('error executing SQL: ' + q) from e
+        self.rows = {}
+        self.count = 0
+
+
+def _transform_array_data(dbtype, prefix, buf, parents, jarray, newattrs, depth, row_ids, arrayattr, max_depth,
                           quasikey):
     if depth > max_depth:
         return
@@ -209,7 +249,7 @@ def _transform_array_data(dbtype, prefix, cur, parents, jarray, newattrs, depth,
             for k, a in quasikey.items():
                 qkey[k] = a
             qkey[prefix + 'o'] = Attr(prefix + 'o', 'integer', data=i + 1)
-            _transform_data(dbtype, prefix, cur, parents, v, newattrs, depth, row_ids, max_depth, qkey)
+            _transform_data(dbtype, prefix, buf, parents, v, newattrs, depth, row_ids, max_depth, qkey)
             continue
         elif isinstance(v, list):
             # TODO
@@ -224,20 +264,16 @@ def _transform_array_data(dbtype, prefix, cur, parents, jarray, newattrs, depth,
             value = v
         else:
             value = v
-        q = 'INSERT INTO ' + _sqlid(table) + '(__id'
-        q += '' if len(quasikey) == 0 else ',' + ','.join([_sqlid(kv[1].name) for kv in quasikey.items()])
-        q += ',' + prefix + 'o,' + _sqlid(a.name)
-        q += ')VALUES(' + str(row_ids[table])
-        q += '' if len(quasikey) == 0 else ',' + ','.join([_encode_sql(dbtype, kv[1].data) for kv in quasikey.items()])
-        q += ',' + str(i + 1) + ',' + _encode_sql(dbtype, value) + ')'
-        try:
-            cur.execute(q)
-        except (RuntimeError, psycopg2.Error) as e:
-            raise RuntimeError('error executing SQL: ' + q) from e
+        row = {'__id': str(row_ids[table])}
+        for qa in quasikey.values():
+            row[qa.name] = _encode_sql(dbtype, qa.data)
+        row[prefix + 'o'] = str(i + 1)
+        row[a.name] = _encode_sql(dbtype, value)
+        buf.add(table, row)
         row_ids[table] += 1
 
 
-def _compile_data(dbtype, prefix, cur, parents, jdict, newattrs, depth, row_ids, max_depth, quasikey):
+def _compile_data(dbtype, prefix, buf, parents, jdict, newattrs, depth, row_ids, max_depth, quasikey):
     if depth > max_depth:
         return
     table = _table_name(parents)
@@ -276,32 +312,27 @@ def _compile_data(dbtype, prefix, cur, parents, jdict, newattrs, depth, row_ids,
                 row.append((a.name, v))
     for b in objects:
         p = [(0, _decode_camel_case(b[2]))]
-        row += _compile_data(dbtype, _decode_camel_case(b[0]) + '__', cur, parents + p, b[1], newattrs, depth + 1,
+        row += _compile_data(dbtype, _decode_camel_case(b[0]) + '__', buf, parents + p, b[1], newattrs, depth + 1,
                              row_ids, max_depth, qkey)
     for y in arrays:
         p = [(1, _decode_camel_case(y[2]))]
-        _transform_array_data(dbtype, _decode_camel_case(y[0]) + '__', cur, parents + p, y[1], newattrs, depth + 1,
+        _transform_array_data(dbtype, _decode_camel_case(y[0]) + '__', buf, parents + p, y[1], newattrs, depth + 1,
                               row_ids, y[0], max_depth, qkey)
     return row
 
 
-def _transform_data(dbtype, prefix, cur, parents, jdict, newattrs, depth, row_ids, max_depth, quasikey):
+def _transform_data(dbtype, prefix, buf, parents, jdict, newattrs, depth, row_ids, max_depth, quasikey):
     if depth > max_depth:
         return
     table = _table_name(parents)
     row = []
     for k, a in quasikey.items():
         row.append((a.name, a.data))
-    row += _compile_data(dbtype, prefix, cur, parents, jdict, newattrs, depth, row_ids, max_depth, quasikey)
-    q = 'INSERT INTO ' + _sqlid(table) + '(__id,'
-    q += ','.join([_sqlid(kv[0]) for kv in row])
-    q += ')VALUES(' + str(row_ids[table]) + ','
-    q += ','.join([_encode_sql(dbtype, kv[1]) for kv in row])
-    q += ')'
-    try:
-        cur.execute(q)
-    except (RuntimeError, psycopg2.Error) as e:
-        raise RuntimeError('error executing SQL: ' + q) from e
+    row += _compile_data(dbtype, prefix, buf, parents, jdict, newattrs, depth, row_ids, max_depth, quasikey)
+    values = {'__id': str(row_ids[table])}
+    for name, v in row:
+        values[name] = _encode_sql(dbtype, v)
+    buf.add(table, values)
     row_ids[table] += 1
 
 
@@ -398,7 +429,7 @@ def _transform_json(db, dbtype, table, total, quiet, max_depth):
         if not quiet:
             pbar = tqdm(desc='transforming', total=total, leave=False, mininterval=3, smoothing=0, colour='#A9A9A9',
                         bar_format='{desc} {bar}{postfix}')
-        cur2 = db.cursor()
+        buf = _InsertBuffer(db.cursor())
         while True:
             row = cur.fetchone()
             if row is None:
@@ -414,10 +445,11 @@ def _transform_json(db, dbtype, table, total, quiet, max_depth):
                 except ValueError:
                     continue
                 table_j = table + '__t' if i == 0 else table + '__t' + str(i + 1)
-                _transform_data(dbtype, '', cur2, [(1, table_j)], jdict, newattrs, 1, row_ids, max_depth, {})
+                _transform_data(dbtype, '', buf, [(1, table_j)], jdict, newattrs, 1, row_ids, max_depth, {})
             if not quiet:
                 pbartotal += 1
                 pbar.update(1)
+        buf.flush()
         if not quiet:
             pbar.close()
     except (RuntimeError, psycopg2.Error, sqlite3.OperationalError, duckdb.CatalogException) as e:
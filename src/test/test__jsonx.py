@@ -0,0 +1,83 @@
+import json
+import sqlite3
+from unittest import TestCase
+
+from src.ldlite._jsonx import _InsertBuffer
+from src.ldlite._jsonx import _transform_json
+from src.ldlite._sqlx import _DBType
+
+RECORDS = [
+    {'id': 'a1', 'firstName': "O'Brien", 'age': 42, 'active': True, 'meta': {'createdBy': 'u1', 'score': 1.5},
+     'tags': ['x', 'y'], 'addresses': [{'city': 'Paris', 'zipCode': '75001'}, {'city': 'Lyon', 'zipCode': '69001'}]},
+    {'id': 'a2', 'firstName': 'Ann\n', 'age': 7, 'active': False, 'meta': {'createdBy': 'u2', 'score': 3},
+     'tags': [], 'addresses': [{'city': 'Nice'}]},
+    {'id': 'a3', 'firstName': None, 'age': 1, 'active': True, 'meta': {'createdBy': 'u3', 'score': 0},
+     'tags': ['z'], 'addresses': []},
+]
+
+# Output of the row-at-a-time transform that preceded _InsertBuffer
+EXPECTED = {
+    'g__t': (['__id', 'id', 'first_name', 'age', 'active', 'meta__created_by', 'meta__score'],
+             [(1, 'a1', "O'Brien", 42, 1, 'u1', 1.5),
+              (2, 'a2', 'Ann\n', 7, 0, 'u2', 3),
+              (3, 'a3', None, 1, 1, 'u3', 0)]),
+    'g__t__addresses': (['__id', 'id', 'first_name', 'age', 'active', 'addresses__o', 'addresses__city',
+                         'addresses__zip_code'],
+                        [(1, 'a1', "O'Brien", 42, 1, 1, 'Paris', '75001'),
+                         (2, 'a1', "O'Brien", 42, 1, 2, 'Lyon', '69001'),
+                         (3, 'a2', 'Ann\n', 7, 0, 1, 'Nice', None)]),
+    'g__t__tags': (['__id', 'id', 'first_name', 'age', 'active', 'tags__o', 'tags'],
+                   [(1, 'a1', "O'Brien", 42, 1, 1, 'x'),
+                    (2, 'a1', "O'Brien", 42, 1, 2, 'y'),
+                    (3, 'a3', None, 1, 1, 1, 'z')]),
+    'g__tcatalog': (['table_name'], [('g__t',), ('g__t__addresses',), ('g__t__tags',)]),
+}
+
+
+def _read_tables(db, tables):
+    out = {}
+    for t in tables:
+        cur = db.execute('SELECT * FROM "' + t + '" ORDER BY 1')
+        out[t] = ([d[0] for d in cur.description], cur.fetchall())
+    return out
+
+
+class TestTransformJSON(TestCase):
+    def test_transform_tables(self):
+        db = sqlite3.connect(':memory:')
+        db.execute('CREATE TABLE g (__id integer, jsonb text)')
+        for i, r in enumerate(RECORDS):
+            db.execute('INSERT INTO g VALUES (?, ?)', (i + 1, json.dumps(r)))
+        db.commit()
+        tables, _ = _transform_json(db, _DBType.SQLITE, 'g', len(RECORDS), True, 3)
+        self.assertEqual(_read_tables(db, tables), EXPECTED)
+
+    def test_transform_scan_order(self):
+        # Records with different keys must still be written in __id order
+        db = sqlite3.connect(':memory:')
+        db.execute('CREATE TABLE g (__id integer, jsonb text)')
+        for i in range(1, 11):
+            r = {'id': 'a' + str(i), 'tags': ['x'] if i % 3 == 0 else ['x', 'y']}
+            if i % 2 == 1:
+                r['name'] = 'n' + str(i)
+            db.execute('INSERT INTO g VALUES (?, ?)', (i, json.dumps(r)))
+        db.commit()
+        _transform_json(db, _DBType.SQLITE, 'g', 10, True, 3)
+        self.assertEqual(db.execute('SELECT __id, id, name FROM g__t').fetchall(),
+                         [(i, 'a' + str(i), 'n' + str(i) if i % 2 == 1 else None) for i in range(1, 11)])
+        self.assertEqual([r[0] for r in db.execute('SELECT __id FROM g__t__tags').fetchall()], list(range(1, 18)))
+
+    def test_insert_buffer_flush(self):
+        db = sqlite3.connect(':memory:')
+        db.execute('CREATE TABLE a (__id bigint, x text, y text)')
+        db.execute('CREATE TABLE b (__id bigint, z numeric)')
+        buf = _InsertBuffer(db.cursor(), size=2)
+        buf.add('a', {'__id': '1', 'x': "'p'"})
+        buf.add('b', {'__id': '1', 'z': '5'})
+        # The second row reached the buffer size and flushed both tables
+        self.assertEqual(buf.count, 0)
+        buf.add('a', {'__id': '2', 'y': "'r'"})
+        buf.add('a', {'__id': '3', 'x': "'q'", 'y': "'s'"})
+        self.assertEqual(db.execute('SELECT count(*) FROM a').fetchone(), (3,))
+        self.assertEqual(db.execute('SELECT * FROM a').fetchall(), [(1, 'p', None), (2, None, 'r'), (3, 'q', 's')])
+        self.assertEqual(db.execute('SELECT * FROM b').fetchall(), [(1, 5)])
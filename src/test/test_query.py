@@ -0,0 +1,202 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest import TestCase
+from unittest import mock
+from urllib.parse import parse_qsl
+
+import requests
+
+import src.ldlite
+from src.ldlite import LDLite
+from src.ldlite._ingest import _insert_rows
+
+
+class _Response:
+    def __init__(self, status_code, obj=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(obj if obj is not None else {}).encode()
+        self.text = self.content.decode()
+        self.headers = headers if headers is not None else {}
+        self.cookies = {}
+
+
+class _FolioStub:
+    """Serves records from memory in place of requests.Session.get/post."""
+
+    def __init__(self, records, total='exact', slow_first=False, expire_after=None, delay=0):
+        self.records = records
+        self.total = total
+        self.slow_first = slow_first
+        self.expire_after = expire_after
+        self.delay = delay
+        self.token = 'token0'
+        self.gets = 0
+        self.logins = 0
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        with self.lock:
+            self.in_flight += 1
+        try:
+            return self._get(params, headers)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _get(self, params, headers):
+        q = dict(parse_qsl(params)) if isinstance(params, str) else dict(params)
+        offset = int(q['offset'])
+        limit = int(q['limit'])
+        if self.slow_first:
+            # Earlier pages finish last
+            time.sleep(max(0, 50 - offset) * 0.001)
+        time.sleep(self.delay)
+        with self.lock:
+            self.gets += 1
+            if self.expire_after is not None and self.gets > self.expire_after and self.logins == 0:
+                self.token = 'expired'
+            if headers['X-Okapi-Token'] != self.token:
+                return _Response(401)
+        n = len(self.records)
+        body = {'items': self.records[offset:offset + limit]}
+        if self.total == 'exact':
+            body['totalRecords'] = n
+        elif self.total == 'low':
+            body['totalRecords'] = n // 3
+        elif self.total == 'high':
+            body['totalRecords'] = n * 3
+        return _Response(200, body)
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        with self.lock:
+            self.logins += 1
+            self.token = 'token' + str(self.logins)
+            return _Response(201, headers={'x-okapi-token': self.token})
+
+
+def _records(n):
+    return [{'id': 'id' + str(i), 'name': "O'Brien \\ " + str(i) + '\n', 'n': i} for i in range(n)]
+
+
+class TestQuery(TestCase):
+    def _query(self, stub, dbtype, limit=None, page_size=10, ld=None):
+        if ld is None:
+            ld = LDLite()
+            if dbtype == 'duckdb':
+                ld.connect_db()
+            else:
+                ld.experimental_connect_db_sqlite()
+        ld.connect_okapi_token('https://folio.example.org', 'diku', stub.token)
+        ld.okapi_user = 'diku_admin'
+        ld.okapi_password = 'admin'
+        ld.quiet(True)
+        ld._set_page_size(page_size)
+        with mock.patch.object(requests.Session, 'get', stub.get), \
+                mock.patch.object(requests.Session, 'post', stub.post):
+            ld.query(table='g', path='/items', query='cql.allRecords=1 sortby id', limit=limit, json_depth=0)
+        cur = ld.db.cursor()
+        try:
+            cur.execute('SELECT __id, jsonb FROM g ORDER BY __id')
+            return [(r[0], json.loads(r[1])) for r in cur.fetchall()]
+        finally:
+            cur.close()
+
+    def _expected(self, records):
+        return [(i + 1, r) for i, r in enumerate(records)]
+
+    def test_last_page(self):
+        for dbtype in ['duckdb', 'sqlite']:
+            for n in [30, 25, 0]:
+                with self.subTest(dbtype=dbtype, n=n):
+                    records = _records(n)
+                    self.assertEqual(self._query(_FolioStub(records), dbtype), self._expected(records))
+
+    def test_total_records(self):
+        for dbtype in ['duckdb', 'sqlite']:
+            for total in ['exact', 'low', 'high', 'missing']:
+                with self.subTest(dbtype=dbtype, total=total):
+                    records = _records(95)
+                    self.assertEqual(self._query(_FolioStub(records, total=total), dbtype),
+                                     self._expected(records))
+
+    def test_limit(self):
+        for dbtype in ['duckdb', 'sqlite']:
+            for limit in [0, 5, 10, 25, 1000]:
+                with self.subTest(dbtype=dbtype, limit=limit):
+                    records = _records(30)
+                    self.assertEqual(self._query(_FolioStub(records), dbtype, limit=limit),
+                                     self._expected(records[:limit]))
+
+    def test_pages_out_of_order(self):
+        for dbtype in ['duckdb', 'sqlite']:
+            with self.subTest(dbtype=dbtype):
+                records = _records(60)
+                self.assertEqual(self._query(_FolioStub(records, slow_first=True), dbtype),
+                                 self._expected(records))
+
+    def test_relogin_once(self):
+        for dbtype in ['duckdb', 'sqlite']:
+            with self.subTest(dbtype=dbtype):
+                records = _records(200)
+                stub = _FolioStub(records, expire_after=3, delay=0.02)
+                self.assertEqual(self._query(stub, dbtype), self._expected(records))
+                self.assertEqual(stub.logins, 1)
+
+    def test_prefetch_without_total(self):
+        for dbtype in ['duckdb', 'sqlite']:
+            with self.subTest(dbtype=dbtype):
+                records = _records(95)
+                stub = _FolioStub(records, total='missing', delay=0.01)
+                in_flight = []
+
+                def insert_rows(*args):
+                    # Inserting is made slower than fetching
+                    time.sleep(0.002)
+                    in_flight.append(stub.in_flight)
+                    time.sleep(0.018)
+                    return _insert_rows(*args)
+
+                with mock.patch.object(src.ldlite, '_insert_rows', insert_rows):
+                    self.assertEqual(self._query(stub, dbtype), self._expected(records))
+                # Each page after the first is inserted while the next one is being fetched
+                self.assertEqual(len(in_flight), 10)
+                self.assertNotIn(0, in_flight[1:])
+
+    def _sqlite_file_query(self, journal_mode):
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, 'ldlite.db')
+            reader = sqlite3.connect(filename)
+            try:
+                reader.execute('PRAGMA journal_mode=' + journal_mode)
+                reader.execute('CREATE TABLE t (x integer)')
+                reader.commit()
+                ld = LDLite()
+                db = ld.experimental_connect_db_sqlite(filename)
+                try:
+                    records = _records(25)
+                    self.assertEqual(self._query(_FolioStub(records), 'sqlite', ld=ld), self._expected(records))
+                    self.assertEqual(db.execute('PRAGMA journal_mode').fetchone(), (journal_mode,))
+                    self.assertEqual(db.execute('PRAGMA synchronous').fetchone(), (2,))
+                    self.assertEqual(reader.execute('SELECT count(*) FROM g').fetchone(), (25,))
+                finally:
+                    db.close()
+            finally:
+                reader.close()
+
+    def test_sqlite_wal(self):
+        self._sqlite_file_query('wal')
+
+    def test_sqlite_rollback_journal(self):
+        self._sqlite_file_query('delete')
+
+    def test_big_integers(self):
+        for dbtype in ['duckdb', 'sqlite']:
+            with self.subTest(dbtype=dbtype):
+                records = [{'id': 'id0', 'n': 123456789012345678901234}, {'id': 'id1', 'n': -9223372036854775809},
+                           {'id': 'id2', 'n': 18446744073709551615}]
+                self.assertEqual(self._query(_FolioStub(records), dbtype), self._expected(records))